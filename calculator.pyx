@@ -0,0 +1,57 @@
+# cython: language_level=3, overflowcheck=True
+"""
+Compiled counterpart of the Calculator class in test_input.py.
+
+Same public API; `add` works on 64-bit C long longs (overflowcheck raises
+OverflowError instead of wrapping) and the attributes live in C struct slots.
+"""
+
+from collections import deque, namedtuple
+
+Stats = namedtuple("Stats", ["sum", "max", "count"])
+
+
+cdef class Calculator:
+    cdef public str name
+    cdef public object history
+
+    def __init__(self, str name, history_size=None):
+        self.name = name
+        # With history_size set, only the most recent operations are kept
+        self.history = deque(maxlen=history_size)
+
+    cpdef long long add(self, long long a, long long b):
+        cdef long long result = a + b
+        # Store the operands; the message is only built when history is read
+        self.history.append((a, b, result))
+        return result
+
+    def format_history(self):
+        return [f"Added {a} + {b} = {result}" for a, b, result in self.history]
+
+    def process_numbers(self, numbers):
+        cdef Py_ssize_t i, n
+        cdef list items, out
+        cdef long long x
+        if type(numbers) is list:
+            # Index the list directly and work on C long longs; anything that
+            # isn't a machine-sized int drops to the generic comprehension
+            items = <list>numbers
+            n = len(items)
+            out = []
+            try:
+                for i in range(n):
+                    item = items[i]
+                    if type(item) is not int:
+                        break
+                    x = item
+                    if x > 0:
+                        out.append(x * 2)
+                else:
+                    return out
+            except OverflowError:
+                pass
+        return [v * 2 for v in numbers if v > 0]
+
+    def get_stats(self, data):
+        return Stats(sum(data), max(data), len(data))
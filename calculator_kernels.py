@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+NumPy array paths and Numba kernels for the sample Calculator in test_input.py.
+
+Kept in their own plain-Python module so test_input.py can be compiled with
+mypyc (Numba needs real Python functions and cannot JIT mypyc-compiled ones)
+and so the sample itself stays plain, translatable Python.
+Nothing heavy happens at import: load_kernels() imports NumPy and Numba and
+compiles the kernels the first time an integer array needs them.
+"""
+
+import sys
+from typing import Any, Callable, Optional, Tuple
+
+Kernel = Optional[Callable[..., Any]]
+
+np: Any = None  # bound by load_kernels(); the kernels resolve it when compiled
+
+_kernels: Optional[Tuple[Kernel, Kernel]] = None
+
+
+def _process_numbers(a):
+    # Two passes: count the positives, then fill an exactly-sized result
+    n = a.shape[0]
+    k = 0
+    for i in range(n):
+        if a[i] > 0:
+            k += 1
+    out = np.empty(k, np.int64)
+    j = 0
+    for i in range(n):
+        v = a[i]
+        if v > 0:
+            out[j] = v * 2
+            j += 1
+    return out
+
+
+def _stats(a):
+    # sum, max and count in a single pass over the array
+    s = 0
+    m = a[0]
+    n = a.shape[0]
+    for i in range(n):
+        v = a[i]
+        s += v
+        if v > m:
+            m = v
+    return s, m, n
+
+
+def load_kernels() -> Tuple[Kernel, Kernel]:
+    """
+    Return the (process_numbers, stats) kernels, compiling them on first use.
+
+    Both are None when NumPy or Numba is unavailable.
+    """
+    global _kernels, np
+    if _kernels is None:
+        _kernels = (None, None)
+        # Numba is only worth loading on CPython: PyPy's tracing JIT already compiles
+        # the plain loops in test_input.py, and importing numba there is slow or unsupported
+        if sys.implementation.name == "cpython":
+            try:
+                import numba
+                import numpy
+            except ImportError:
+                pass
+            else:
+                np = numpy
+                # Explicit signatures compile both kernels here, on first use
+                # rather than at import or on each kernel's first call, and
+                # cache=True stores the machine code next to the module so
+                # later runs skip compilation
+                _kernels = (
+                    numba.njit("int64[:](int64[:])", cache=True)(_process_numbers),
+                    numba.njit("UniTuple(int64, 3)(int64[:])", cache=True)(_stats),
+                )
+    return _kernels
+
+
+def process_array(numbers: Any) -> Any:
+    """
+    Double the positive elements of a NumPy array, or return None for anything else.
+
+    An array can only arrive once the caller has imported NumPy, so lists and
+    tuples never load NumPy or Numba.
+    """
+    numpy = sys.modules.get("numpy")
+    if numpy is None or not isinstance(numbers, numpy.ndarray):
+        return None
+    if numbers.dtype.kind == "i":
+        kernel = load_kernels()[0]
+        if kernel is not None:
+            return kernel(numbers.astype(numpy.int64, copy=False))
+    # compress() selects through NumPy's fast path for boolean conditions;
+    # doubling afterwards only touches the kept elements
+    return numpy.compress(numbers > 0, numbers) * 2
+
+
+def array_stats(data: Any) -> Optional[Tuple[Any, Any, int]]:
+    """Return (sum, max, count) for a non-empty NumPy array, or None for anything else."""
+    numpy = sys.modules.get("numpy")
+    if numpy is None or not isinstance(data, numpy.ndarray) or not data.size:
+        return None
+    if data.dtype.kind == "i":
+        kernel = load_kernels()[1]
+        if kernel is not None:
+            total, largest, count = kernel(data.astype(numpy.int64, copy=False))
+            return int(total), int(largest), count
+    return data.sum().item(), data.max().item(), data.size
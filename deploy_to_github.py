@@ -4,15 +4,25 @@ GitHub deployment automation script for Python to C# Translator
 """
 
 import os
+import re
+import shlex
 import subprocess
 import sys
+from functools import lru_cache
 from pathlib import Path
 
+@lru_cache(maxsize=1)
+def _git_ok():
+    """Return True if `git --version` runs; probed once per deploy run."""
+    try:
+        return subprocess.run(["git", "--version"], capture_output=True).returncode == 0
+    except FileNotFoundError:
+        return False
+
 def ensure_git_available():
     """Ensure Git is available in PATH, add common installation paths if needed."""
     # First check if git is already available
-    result = subprocess.run(["git", "--version"], capture_output=True, text=True)
-    if result.returncode == 0:
+    if _git_ok():
         return True
     
     # Common Git installation paths on Windows
@@ -30,6 +40,7 @@ def ensure_git_available():
             current_path = os.environ.get("PATH", "")
             if expanded_path not in current_path:
                 os.environ["PATH"] = current_path + os.pathsep + expanded_path
+                _git_ok.cache_clear()
                 print(f"✅ Added Git to PATH: {expanded_path}")
             return True
     
@@ -37,12 +48,18 @@ def ensure_git_available():
     return False
 
 def run_command(cmd, check=True):
-    """Run a shell command and return the result."""
-    print(f"🔄 Running: {cmd}")
-    result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+    """Run a command given as an argv list (no shell) and return the result."""
+    # shlex.join() needs Python 3.8; quote by hand to keep 3.7 working
+    shown = " ".join(map(shlex.quote, cmd))
+    print(f"🔄 Running: {shown}")
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True)
+    except FileNotFoundError:
+        print(f"❌ Command not found: {cmd[0]}")
+        return False
     
     if check and result.returncode != 0:
-        print(f"❌ Error running command: {cmd}")
+        print(f"❌ Error running command: {shown}")
         print(f"Error: {result.stderr}")
         return False
     
@@ -53,13 +70,14 @@ def run_command(cmd, check=True):
 
 def check_git_installed():
     """Check if git is installed."""
-    return run_command("git --version", check=False)
+    return _git_ok()
 
 def check_project_files():
     """Check if all required project files exist."""
     required_files = [
         "py_to_cs_agent.py",
         "test_input.py", 
+        "calculator_kernels.py",
         "README_GITHUB.md",
         "LICENSE",
         "CONTRIBUTING.md",
@@ -67,10 +85,10 @@ def check_project_files():
         ".gitignore"
     ]
     
-    missing_files = []
-    for file in required_files:
-        if not Path(file).exists():
-            missing_files.append(file)
+    # One directory listing instead of a stat() per required file
+    with os.scandir(".") as entries:
+        present = {entry.name for entry in entries}
+    missing_files = [file for file in required_files if file not in present]
     
     if missing_files:
         print(f"❌ Missing required files: {missing_files}")
@@ -95,10 +113,35 @@ def initialize_git_repo(commit_message=None):
 - CLI interface with file I/O
 - Comprehensive documentation"""
     
+    try:
+        import pygit2
+    except ImportError:
+        pygit2 = None
+    
+    if pygit2 is not None:
+        # libgit2 builds the index in-process: no git subprocesses, one repo open
+        print("🔄 Initializing repository with pygit2")
+        try:
+            repo = pygit2.init_repository(".")
+            index = repo.index
+            index.add_all()
+            index.write()
+            tree = index.write_tree()
+            try:
+                signature = repo.default_signature
+            except (KeyError, pygit2.GitError):
+                signature = pygit2.Signature("deploy", "deploy@local")
+            repo.create_commit("HEAD", signature, signature, commit_message, tree, [])
+        except pygit2.GitError as e:
+            print(f"❌ Error initializing repository: {e}")
+            return False
+        print("✅ Initial commit created")
+        return True
+    
     commands = [
-        "git init",
-        "git add .",
-        f'git commit -m "{commit_message}"'
+        ["git", "init"],
+        ["git", "add", "."],
+        ["git", "commit", "-m", commit_message]
     ]
     
     for cmd in commands:
@@ -128,16 +171,16 @@ def setup_github_remote(username=None, repo_name=None):
     if result.returncode == 0:
         # Remote exists, update it
         print("📝 Updating existing remote origin...")
-        if not run_command(f"git remote set-url origin {remote_url}"):
+        if not run_command(["git", "remote", "set-url", "origin", remote_url]):
             return False
     else:
         # Remote doesn't exist, add it
         print("➕ Adding new remote origin...")
-        if not run_command(f"git remote add origin {remote_url}"):
+        if not run_command(["git", "remote", "add", "origin", remote_url]):
             return False
     
     # Set main branch
-    if not run_command("git branch -M main"):
+    if not run_command(["git", "branch", "-M", "main"]):
         return False
     
     print(f"✅ GitHub remote configured: {remote_url}")
@@ -153,7 +196,7 @@ def push_to_github():
         print("❌ No commits found. Creating initial commit...")
         
         # Ensure we have files to commit
-        if not run_command("git add ."):
+        if not run_command(["git", "add", "."]):
             return False
         
         # Check if there are files staged
@@ -164,15 +207,15 @@ def push_to_github():
             return False
         
         # Create initial commit
-        if not run_command('git commit -m "Initial commit: Python to C# translator"'):
+        if not run_command(["git", "commit", "-m", "Initial commit: Python to C# translator"]):
             return False
     
     # Ensure we're on main branch
-    if not run_command("git branch -M main"):
+    if not run_command(["git", "branch", "-M", "main"]):
         return False
     
     # Now push
-    return run_command("git push -u origin main")
+    return run_command(["git", "push", "-u", "origin", "main"])
 
 def update_readme_urls(username, repo_name="python-to-csharp-translator"):
     """Update GitHub URLs in README with actual username."""
@@ -182,21 +225,24 @@ def update_readme_urls(username, repo_name="python-to-csharp-translator"):
         print("❌ README_GITHUB.md not found")
         return False
     
-    # Read and update content
+    # Read and update content in a single pass over the text
     content = readme_path.read_text(encoding='utf-8')
-    updated_content = content.replace('yourusername', username)
-    updated_content = updated_content.replace('python-to-csharp-translator', repo_name)
-    
-    # Write to README.md
-    readme_final = Path("README.md")
-    readme_final.write_text(updated_content, encoding='utf-8')
+    replacements = {'yourusername': username, 'python-to-csharp-translator': repo_name}
+    updated_content = re.sub(
+        'yourusername|python-to-csharp-translator',
+        lambda match: replacements[match.group(0)],
+        content
+    )
+    
+    # Rename README_GITHUB.md over README.md, write the updated text and commit both paths
+    if not run_command(["git", "mv", "-f", "README_GITHUB.md", "README.md"]):
+        return False
+    Path("README.md").write_text(updated_content, encoding='utf-8')
     
-    # Remove old file and commit changes
     commands = [
-        "git add README.md",
-        "git rm README_GITHUB.md",
-        f'git commit -m "docs: update GitHub URLs for user {username}"',
-        "git push"
+        ["git", "commit", "-m", f"docs: update GitHub URLs for user {username}",
+         "--", "README.md", "README_GITHUB.md"],
+        ["git", "push"]
     ]
     
     for cmd in commands:
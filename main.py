@@ -1,68 +1,356 @@
 import sys
 import subprocess
 import os
+import atexit
+import hashlib
+import importlib.metadata
+import importlib.util
+import json
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
-# List of dependencies to check and install if missing
-dependencies = ["openai", "transformers", "torch"]
-for dep in dependencies:
-    try:
-        __import__(dep)
-    except ImportError:
-        msubprocess.check_call([sys.executable, "-m", "pip", "install", dep])
+# Dependencies to check and install if missing (set SKIP_AUTO_INSTALL to opt out),
+# mapped to the pip requirement to install
+dependencies = {"openai": "openai>=1.0", "transformers": "transformers", "torch": "torch"}
+
+def _needs_install(module):
+    if importlib.util.find_spec(module) is None:
+        return True
+    if module == "openai":
+        # openai 0.x imports fine but has no OpenAI client class; upgrade it
+        try:
+            return int(importlib.metadata.version("openai").split(".")[0]) < 1
+        except importlib.metadata.PackageNotFoundError:
+            return False
+    return False
+
+missing = [dependencies[dep] for dep in dependencies if _needs_install(dep)]
+if missing and not os.environ.get("SKIP_AUTO_INSTALL"):
+    subprocess.check_call([sys.executable, "-m", "pip", "install", "--disable-pip-version-check", *missing])
 
 import tkinter as tk
-from tkinter import ttk, scrolledtext
-import openai
-from transformers import pipeline
+from tkinter import ttk, scrolledtext, messagebox
+import httpx
+from openai import OpenAI
+
+# Let the fast tokenizers use their own thread pool; set before transformers is imported
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "true")
 
-# Initialize Hugging Face text-generation pipeline
-text_gen = pipeline("text-generation", model="gpt2")
+# Hugging Face text-generation pipelines, loaded on first use and keyed by model name
+_pipelines = {}
 
 # Define available models
 OPENAI_MODELS = ["gpt-4", "gpt-3.5-turbo", "text-davinci-003"]
 HF_MODELS = ["gpt2", "distilgpt2"]
-MODELS = OPENAI_MODELS + HF_MODELS
+
+# Serve Hugging Face models from a local OpenAI-compatible server (e.g. vLLM)
+# instead of in-process pipelines when set, e.g. http://localhost:8000/v1
+VLLM_URL = os.getenv("VLLM_URL")
+
+# One pooled keep-alive HTTP client shared by every request, so TLS/TCP setup is
+# paid once rather than per call; HTTP/2 is used when the h2 package is available
+_http_client = httpx.Client(
+    http2=importlib.util.find_spec("h2") is not None,
+    limits=httpx.Limits(max_keepalive_connections=20)
+)
 
 # Set your OpenAI API key via environment variable
-openai.api_key = os.getenv("OPENAI_API_KEY")
+client = OpenAI(api_key=os.getenv("OPENAI_API_KEY", ""), http_client=_http_client)
+local_client = OpenAI(base_url=VLLM_URL, api_key="EMPTY", http_client=_http_client) if VLLM_URL else None
+
+def get_pipeline(name):
+    """Return the text-generation pipeline for `name`, loading it on first access."""
+    text_gen = _pipelines.get(name)
+    if text_gen is None:
+        import torch
+        from transformers import pipeline
+        if torch.cuda.is_available():
+            torch.backends.cuda.matmul.allow_tf32 = True
+            # Half-precision weights halve the memory traffic per decoded token
+            text_gen = pipeline("text-generation", model=name,
+                                torch_dtype=torch.float16, device=0)
+        else:
+            try:
+                from optimum.intel.openvino import OVModelForCausalLM
+            except ImportError:
+                text_gen = pipeline("text-generation", model=name, device=-1)
+            else:
+                # INT8 OpenVINO weights when optimum-intel is installed
+                from transformers import AutoTokenizer
+                ov_model = OVModelForCausalLM.from_pretrained(name, export=True, load_in_8bit=True)
+                text_gen = pipeline("text-generation", model=ov_model,
+                                    tokenizer=AutoTokenizer.from_pretrained(name))
+        _pipelines[name] = text_gen
+    return text_gen
+
+# Response cache: exact matches are persisted across runs, near-duplicate prompts
+# are matched by sentence-embedding similarity when sentence-transformers is installed
+CACHE_PATH = os.path.expanduser("~/.ai_assistant_cache.json")
+SEMANTIC_THRESHOLD = 0.92
+SEMANTIC_CACHE = importlib.util.find_spec("sentence_transformers") is not None
+
+def _load_cache():
+    try:
+        with open(CACHE_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+_exact_cache = _load_cache()
+_semantic_index = {}  # (model, max_tokens) -> (embedding matrix, answers)
+_embedder = None
+
+@atexit.register
+def _save_cache():
+    try:
+        with open(CACHE_PATH, "w", encoding="utf-8") as f:
+            json.dump(_exact_cache, f)
+    except OSError:
+        pass
+
+def _cache_key(model, prompt, max_tokens):
+    # Feed the parts separately rather than hashing a concatenated copy of the prompt;
+    # max_tokens is part of the key so a short answer is never served for a longer limit
+    key = hashlib.sha256(model.encode())
+    key.update(b"\0%d\0" % max_tokens)
+    key.update(prompt.encode())
+    return key.hexdigest()
+
+def _embed(prompt):
+    global _embedder
+    if _embedder is None:
+        from sentence_transformers import SentenceTransformer
+        _embedder = SentenceTransformer("all-MiniLM-L6-v2")
+    return _embedder.encode(prompt, normalize_embeddings=True)
+
+def cached_response(model, prompt, max_tokens):
+    """Return a cached answer for `prompt` on `model` at `max_tokens`, or None on a miss."""
+    answer = _exact_cache.get(_cache_key(model, prompt, max_tokens))
+    index_key = (model, max_tokens)
+    if answer is not None or not SEMANTIC_CACHE or index_key not in _semantic_index:
+        return answer
+    import numpy as np
+    vectors, answers = _semantic_index[index_key]
+    scores = np.dot(vectors, _embed(prompt))
+    best = int(np.argmax(scores))
+    if scores[best] > SEMANTIC_THRESHOLD:
+        return answers[best]
+    return None
+
+def cache_response(model, prompt, max_tokens, answer):
+    """Store `answer` in both cache tiers."""
+    _exact_cache[_cache_key(model, prompt, max_tokens)] = answer
+    if SEMANTIC_CACHE:
+        import numpy as np
+        vector = _embed(prompt)
+        index_key = (model, max_tokens)
+        if index_key in _semantic_index:
+            vectors, answers = _semantic_index[index_key]
+            _semantic_index[index_key] = (np.vstack([vectors, vector]), answers + [answer])
+        else:
+            _semantic_index[index_key] = (vector[np.newaxis, :], [answer])
+
+# Decode cost grows linearly with output length, so keep the default answer short
+DEFAULT_MAX_TOKENS = 200
+
+def generate(model, prompt, max_tokens=DEFAULT_MAX_TOKENS):
+    """Run `prompt` through `model`, yielding the generated text as it arrives."""
+    if model in OPENAI_MODELS:
+        if model.startswith("gpt-"):
+            res = client.chat.completions.create(
+                model=model,
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=max_tokens,
+                stream=True
+            )
+            for chunk in res:
+                if chunk.choices:
+                    yield chunk.choices[0].delta.content or ""
+        else:
+            res = client.completions.create(
+                model=model,
+                prompt=prompt,
+                max_tokens=max_tokens,
+                stream=True
+            )
+            for chunk in res:
+                yield chunk.choices[0].text
+        return
+    if local_client is not None:
+        # Base models like gpt2 have no chat template, so use the completions route
+        res = local_client.completions.create(
+            model=model,
+            prompt=prompt,
+            max_tokens=max_tokens,
+            stream=True
+        )
+        for chunk in res:
+            yield chunk.choices[0].text
+        return
+    from transformers import TextIteratorStreamer
+    text_gen = get_pipeline(model)
+    streamer = TextIteratorStreamer(text_gen.tokenizer, skip_special_tokens=True)
+    inputs = text_gen.tokenizer(prompt, return_tensors="pt").to(text_gen.model.device)
+    errors = []
+
+    def run():
+        try:
+            text_gen.model.generate(**inputs, max_new_tokens=max_tokens,
+                                    do_sample=True, streamer=streamer)
+        except BaseException as e:
+            # Unblock the consumer below and hand the error back to it
+            errors.append(e)
+            streamer.end()
+
+    threading.Thread(target=run, daemon=True).start()
+    yield from streamer
+    if errors:
+        raise errors[0]
+
+# Prompts are capped to what is left of the model's context window after the
+# requested answer length, so an oversized paste cannot overflow it
+CONTEXT_WINDOWS = {
+    "gpt-4": 8192,
+    "gpt-3.5-turbo": 4096,
+    "text-davinci-003": 4097,
+    "gpt2": 1024,
+    "distilgpt2": 1024,
+}
+# Headroom for chat message framing and tokenizer differences
+PROMPT_MARGIN_TOKENS = 16
+
+def _encoding(model):
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    if model in HF_MODELS:
+        # GPT-2 family models share the original GPT-2 byte-pair encoding
+        return tiktoken.get_encoding("gpt2")
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+def count_tokens(model, prompt):
+    """Return the number of tokens `prompt` uses on `model` (estimated without tiktoken)."""
+    enc = _encoding(model)
+    if enc is None:
+        # Roughly four characters per token for English text
+        return len(prompt) // 4
+    return len(enc.encode(prompt))
+
+def token_limits(model, max_tokens):
+    """Return (prompt token budget, answer token limit) that fit `model`'s context window.
+
+    The answer limit is capped at half the window so a large max_tokens setting
+    on a small model still leaves room for the prompt.
+    """
+    window = CONTEXT_WINDOWS.get(model, 4096)
+    max_tokens = min(max_tokens, window // 2)
+    return window - max_tokens - PROMPT_MARGIN_TOKENS, max_tokens
+
+def truncate_prompt(model, prompt, budget):
+    """Return `prompt` cut down to at most `budget` tokens for `model`."""
+    enc = _encoding(model)
+    if enc is None:
+        return prompt[:budget * 4]
+    tokens = enc.encode(prompt)
+    if len(tokens) <= budget:
+        return prompt
+    return enc.decode(tokens[:budget])
+
+# The "auto" entry sends short prompts to the cheaper, faster model
+AUTO_MODEL = "auto"
+AUTO_TOKEN_THRESHOLD = 1500
+
+def route_model(prompt):
+    """Pick a concrete OpenAI model for `prompt`; returns (model, prompt token count)."""
+    n_tokens = count_tokens("gpt-3.5-turbo", prompt)
+    return ("gpt-3.5-turbo" if n_tokens < AUTO_TOKEN_THRESHOLD else "gpt-4"), n_tokens
+
+# LLM calls run on worker threads so the Tk event loop stays responsive
+_executor = ThreadPoolExecutor(max_workers=4)
+
+def _do_llm(model, prompt, max_tokens, out):
+    budget, max_tokens = token_limits(model, max_tokens)
+    prompt = truncate_prompt(model, prompt, budget)
+    answer = cached_response(model, prompt, max_tokens)
+    if answer is not None:
+        out.put(answer)
+        return
+    parts = []
+    try:
+        for delta in generate(model, prompt, max_tokens):
+            parts.append(delta)
+            out.put(delta)
+    except Exception as e:
+        source = "OpenAI API" if model in OPENAI_MODELS else "Huggingface"
+        out.put(f"{source} error: {e}")
+    else:
+        cache_response(model, prompt, max_tokens, "".join(parts))
+
+def _poll(fut, out):
+    # Check completion before draining so the last deltas are never left behind
+    done = fut.done()
+    while not out.empty():
+        response_text.insert(tk.END, out.get_nowait())
+    if done:
+        # generate() errors are reported by _do_llm; this catches the rest
+        # (prompt truncation, cache lookup/store) so nothing fails silently
+        exc = fut.exception()
+        if exc is not None:
+            response_text.insert(tk.END, f"Error: {exc}")
+        send_button.config(state=tk.NORMAL)
+    else:
+        root.after(50, _poll, fut, out)
+
+def available_models():
+    """Return the model menu entries; call after the Tk root exists so a warning has a parent."""
+    if os.getenv("OPENAI_API_KEY"):
+        return [AUTO_MODEL] + OPENAI_MODELS + HF_MODELS
+    messagebox.showwarning(
+        "OpenAI API key missing",
+        "OPENAI_API_KEY is not set; only Hugging Face models are available."
+    )
+    return list(HF_MODELS)
 
 def send_prompt():
     model = model_var.get()
     prompt = input_text.get("1.0", tk.END).strip()
-    response_text.delete("1.0", tk.END)
-    if model in OPENAI_MODELS:
-        try:
-            if model.startswith("gpt-"):
-                res = openai.ChatCompletion.create(
-                    model=model,
-                    messages=[{"role": "user", "content": prompt}]
-                )
-                answer = res.choices[0].message.content
-            else:
-                res = openai.Completion.create(
-                    model=model,
-                    prompt=prompt,
-                    max_tokens=150
-                )
-                answer = res.choices[0].text.strip()
-        except Exception as e:
-            answer = f"OpenAI API error: {e}"
+    try:
+        max_tokens = max_tokens_var.get()
+    except tk.TclError:
+        max_tokens = DEFAULT_MAX_TOKENS
+    if model == AUTO_MODEL:
+        model, n_tokens = route_model(prompt)
+        status_var.set(f"auto: {n_tokens} prompt tokens, using {model}")
     else:
-        try:
-            gen = text_gen(prompt, max_length=150, do_sample=True)
-            answer = gen[0]["generated_text"]
-        except Exception as e:
-            answer = f"Huggingface error: {e}"
-    response_text.insert(tk.END, answer)
+        status_var.set(f"Using {model}")
+    response_text.delete("1.0", tk.END)
+    send_button.config(state=tk.DISABLED)
+    out = queue.Queue()
+    fut = _executor.submit(_do_llm, model, prompt, max_tokens, out)
+    root.after(50, _poll, fut, out)
 
 # Build GUI
 root = tk.Tk()
 root.title("AI Assistant")
 
+MODELS = available_models()
 model_var = tk.StringVar(value=MODELS[0])
 model_menu = ttk.OptionMenu(root, model_var, MODELS[0], *MODELS)
 model_menu.pack(fill="x", padx=5, pady=5)
 
+options_frame = ttk.Frame(root)
+options_frame.pack(fill="x", padx=5)
+ttk.Label(options_frame, text="Max tokens:").pack(side="left")
+max_tokens_var = tk.IntVar(value=DEFAULT_MAX_TOKENS)
+max_tokens_box = ttk.Spinbox(options_frame, from_=16, to=2048, increment=16,
+                             textvariable=max_tokens_var, width=6)
+max_tokens_box.pack(side="left", padx=5)
+
 input_text = scrolledtext.ScrolledText(root, wrap=tk.WORD, height=10)
 input_text.pack(fill="both", expand=True, padx=5, pady=5)
 
@@ -72,4 +360,8 @@ send_button.pack(pady=5)
 response_text = scrolledtext.ScrolledText(root, wrap=tk.WORD, height=10)
 response_text.pack(fill="both", expand=True, padx=5, pady=5)
 
+status_var = tk.StringVar()
+status_bar = ttk.Label(root, textvariable=status_var, anchor="w")
+status_bar.pack(fill="x", padx=5, pady=(0, 5))
+
 root.mainloop()
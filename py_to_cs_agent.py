@@ -20,106 +20,276 @@ Features:
 
 import ast
 import argparse
+import io
 import sys
 import os
+from collections.abc import Generator
+
+
+# Indentation prefixes for the first 64 nesting levels, built once
+_INDENTS = tuple("    " * level for level in range(64))
+
+# Node classes checked by exact type in the hot paths, bound once at import
+_And = ast.And
+_Attribute = ast.Attribute
+_Call = ast.Call
+_ClassDef = ast.ClassDef
+_Constant = ast.Constant
+_Dict = ast.Dict
+_FormattedValue = ast.FormattedValue
+_FunctionDef = ast.FunctionDef
+_If = ast.If
+_List = ast.List
+_Name = ast.Name
+_Set = ast.Set
+_Slice = ast.Slice
+_Subscript = ast.Subscript
+
+# Function mapping from Python to C#
+_FUNCTION_MAPPING = {
+    'print': 'Console.WriteLine',
+    'len': 'Count',  # For collections
+    'str': 'ToString',
+    'int': 'int.Parse',
+    'float': 'double.Parse',
+    'bool': 'bool.Parse',
+    'range': 'Enumerable.Range',
+    'sum': 'Sum',  # LINQ method
+    'max': 'Max',  # LINQ method
+    'min': 'Min',  # LINQ method
+    'sorted': 'OrderBy',  # LINQ method
+    'reversed': 'Reverse',  # LINQ method
+    'enumerate': 'Select',  # LINQ with index
+    'zip': 'Zip',  # LINQ method
+    'filter': 'Where',  # LINQ method
+    'map': 'Select',  # LINQ method
+    'any': 'Any',  # LINQ method
+    'all': 'All',  # LINQ method
+}
+
+# Method mapping (when called on objects)
+_METHOD_MAPPING = {
+    'append': 'Add',
+    'extend': 'AddRange',
+    'insert': 'Insert',
+    'remove': 'Remove',
+    'pop': 'RemoveAt',
+    'clear': 'Clear',
+    'sort': 'Sort',
+    'reverse': 'Reverse',
+    'index': 'IndexOf',
+    'count': 'Count',
+    'split': 'Split',
+    'join': 'Join',
+    'strip': 'Trim',
+    'lower': 'ToLower',
+    'upper': 'ToUpper',
+    'replace': 'Replace',
+    'startswith': 'StartsWith',
+    'endswith': 'EndsWith',
+    'find': 'IndexOf',
+    'keys': 'Keys',
+    'values': 'Values',
+    'items': 'ToList',  # For dictionary iteration
+}
+
+# Exception mapping
+_EXCEPTION_MAPPING = {
+    'Exception': 'Exception',
+    'ValueError': 'ArgumentException',
+    'TypeError': 'InvalidOperationException',
+    'KeyError': 'KeyNotFoundException',
+    'IndexError': 'IndexOutOfRangeException',
+    'FileNotFoundError': 'FileNotFoundException',
+    'IOError': 'IOException',
+    'RuntimeError': 'SystemException',
+    'NotImplementedError': 'NotImplementedException',
+    'AttributeError': 'MemberAccessException',
+}
+
+# Type mapping
+_TYPE_MAPPING = {
+    'int': 'int',
+    'float': 'double',
+    'str': 'string',
+    'bool': 'bool',
+    'list': 'List',
+    'dict': 'Dictionary',
+    'set': 'HashSet',
+    'tuple': 'Tuple',
+    'None': 'null',
+    'True': 'true',
+    'False': 'false',
+}
+
+# Binary operators, keyed by AST operator type
+_BIN_OPS = {
+    ast.Add: '+',
+    ast.Sub: '-',
+    ast.Mult: '*',
+    ast.Div: '/',
+    ast.FloorDiv: '/',  # Integer division in C#
+    ast.Mod: '%',
+    ast.Pow: 'Math.Pow',  # Special case
+    ast.LShift: '<<',
+    ast.RShift: '>>',
+    ast.BitOr: '|',
+    ast.BitXor: '^',
+    ast.BitAnd: '&',
+}
+
+# Unary operators, keyed by AST operator type
+_UNARY_OPS = {
+    ast.UAdd: '+',
+    ast.USub: '-',
+    ast.Not: '!',
+    ast.Invert: '~',
+}
+
+# Comparison operators, keyed by AST operator type
+_COMPARE_OPS = {
+    ast.Eq: '==',
+    ast.NotEq: '!=',
+    ast.Lt: '<',
+    ast.LtE: '<=',
+    ast.Gt: '>',
+    ast.GtE: '>=',
+    ast.Is: '==',  # Reference equality
+    ast.IsNot: '!=',
+    ast.In: '.Contains',  # Special case
+    ast.NotIn: '!.Contains',  # Special case
+}
+
+
+class _BlockCloser:
+    """Context manager returned by `_block()`; dedents and writes "}" on exit.
+
+    Blocks close in LIFO order, so one instance per translator serves every
+    block. A plain class is used because @contextmanager builds a generator
+    per block, which is measurably slower on the translation hot path.
+    """
+
+    __slots__ = ("translator",)
+
+    def __init__(self, translator):
+        self.translator = translator
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            translator = self.translator
+            translator._pop_indent()
+            translator.buf.write(f"{translator._indent_str}}}\n")
+        return False
 
 
 class PythonToCSharpTranslator(ast.NodeVisitor):
     """AST visitor that translates Python code to C# equivalents."""
     
-    def __init__(self):
-        self.output = []
+    # Node class -> unbound visit_* method (or generic_visit), filled on first use
+    _visit_cache = {}
+
+    def __init_subclass__(cls, **kwargs):
+        """Give each subclass its own method cache and expression table so overrides are honoured."""
+        super().__init_subclass__(**kwargs)
+        cls._visit_cache = {}
+        base = PythonToCSharpTranslator
+        cls._EXPR_DISPATCH = {node_class: getattr(cls, 'visit_' + node_class.__name__)
+                              for node_class in base._EXPR_DISPATCH}
+        # The inlined Name/Constant fast path would bypass overrides of those two
+        if cls.visit_expr is base.visit_expr and (cls.visit_Name is not base.visit_Name
+                                                  or cls.visit_Constant is not base.visit_Constant):
+            cls.visit_expr = base._dispatch_expr
+
+    def __init__(self, buf=None):
+        # Any object with a write() method; translate_file passes the open output file
+        self.buf = io.StringIO() if buf is None else buf
         self.indent_level = 0
+        self._indent_str = ""
         self.in_class = False
         self.current_class = None
-        
-        # Function mapping from Python to C#
-        self.function_mapping = {
-            'print': 'Console.WriteLine',
-            'len': 'Count',  # For collections
-            'str': 'ToString',
-            'int': 'int.Parse',
-            'float': 'double.Parse',
-            'bool': 'bool.Parse',
-            'range': 'Enumerable.Range',
-            'sum': 'Sum',  # LINQ method
-            'max': 'Max',  # LINQ method
-            'min': 'Min',  # LINQ method
-            'sorted': 'OrderBy',  # LINQ method
-            'reversed': 'Reverse',  # LINQ method
-            'enumerate': 'Select',  # LINQ with index
-            'zip': 'Zip',  # LINQ method
-            'filter': 'Where',  # LINQ method
-            'map': 'Select',  # LINQ method
-            'any': 'Any',  # LINQ method
-            'all': 'All',  # LINQ method
-        }
-        
-        # Method mapping (when called on objects)
-        self.method_mapping = {
-            'append': 'Add',
-            'extend': 'AddRange',
-            'insert': 'Insert',
-            'remove': 'Remove',
-            'pop': 'RemoveAt',
-            'clear': 'Clear',
-            'sort': 'Sort',
-            'reverse': 'Reverse',
-            'index': 'IndexOf',
-            'count': 'Count',
-            'split': 'Split',
-            'join': 'Join',
-            'strip': 'Trim',
-            'lower': 'ToLower',
-            'upper': 'ToUpper',
-            'replace': 'Replace',
-            'startswith': 'StartsWith',
-            'endswith': 'EndsWith',
-            'find': 'IndexOf',
-            'keys': 'Keys',
-            'values': 'Values',
-            'items': 'ToList',  # For dictionary iteration
-        }
-        
-        # Exception mapping
-        self.exception_mapping = {
-            'Exception': 'Exception',
-            'ValueError': 'ArgumentException',
-            'TypeError': 'InvalidOperationException',
-            'KeyError': 'KeyNotFoundException',
-            'IndexError': 'IndexOutOfRangeException',
-            'FileNotFoundError': 'FileNotFoundException',
-            'IOError': 'IOException',
-            'RuntimeError': 'SystemException',
-            'NotImplementedError': 'NotImplementedException',
-            'AttributeError': 'MemberAccessException',
-        }
-        
-        # Type mapping
-        self.type_mapping = {
-            'int': 'int',
-            'float': 'double',
-            'str': 'string',
-            'bool': 'bool',
-            'list': 'List',
-            'dict': 'Dictionary',
-            'set': 'HashSet',
-            'tuple': 'Tuple',
-            'None': 'null',
-            'True': 'true',
-            'False': 'false',
-        }
+        # Python string value -> rendered C# literal, shared by repeated constants
+        self._string_literals = {}
+        self._block_closer = _BlockCloser(self)
 
     def indent(self):
         """Return current indentation string."""
-        return "    " * self.indent_level
+        return self._indent_str
+
+    def _push_indent(self):
+        """Increase the indentation level by one."""
+        level = self.indent_level = self.indent_level + 1
+        self._indent_str = _INDENTS[level] if level < 64 else "    " * level
+
+    def _pop_indent(self):
+        """Decrease the indentation level by one."""
+        level = self.indent_level = self.indent_level - 1
+        self._indent_str = _INDENTS[level] if level < 64 else "    " * level
+
+    def _block(self, header=None):
+        """Emit `header` and "{", indent, and close the block on with-exit."""
+        indent = self._indent_str
+        if header is None:
+            self.buf.write(f"{indent}{{\n")
+        else:
+            # Header and opening brace go out in a single write
+            self.buf.write(f"{indent}{header}\n{indent}{{\n")
+        self._push_indent()
+        return self._block_closer
 
     def add_line(self, line=""):
-        """Add a line with proper indentation."""
+        """Write a line with proper indentation to the output buffer."""
         if line:
-            self.output.append(self.indent() + line)
-        else:
-            self.output.append("")
+            self.buf.write(self._indent_str)
+            self.buf.write(line)
+        self.buf.write("\n")
+
+    def _resolve_visit(self, node_class):
+        """Look up the visit_* method for `node_class` and cache it."""
+        cls = type(self)
+        method = getattr(cls, 'visit_' + node_class.__name__, cls.generic_visit)
+        self._visit_cache[node_class] = method
+        return method
+
+    def visit(self, node):
+        """Visit a node, resolving its visit_* method once per node type."""
+        node_class = node.__class__
+        method = self._visit_cache.get(node_class) or self._resolve_visit(node_class)
+        result = method(self, node)
+        if result is not None and isinstance(result, Generator):
+            self._run([result])
+            return None
+        return result
+
+    def _emit_block(self, body):
+        """Translate a list of statements in order."""
+        self._run([iter(body)])
+
+    def _run(self, stack):
+        """
+        Drive statement visitors with an explicit work stack.
+        
+        Visitors for compound statements are generators that yield each
+        statement list (body, orelse, ...) they need translated and resume
+        once it has been emitted, so nesting depth never grows the Python
+        call stack.
+        """
+        cache = self._visit_cache
+        while stack:
+            item = next(stack[-1], None)
+            if item is None:
+                stack.pop()
+            elif type(item) is list:
+                stack.append(iter(item))
+            else:
+                node_class = item.__class__
+                method = cache.get(node_class) or self._resolve_visit(node_class)
+                # Checked against the ABC so Cython-compiled generators match too
+                result = method(self, item)
+                if result is not None and isinstance(result, Generator):
+                    stack.append(result)
 
     def visit_Module(self, node):
         """Handle module-level code."""
@@ -129,28 +299,25 @@ class PythonToCSharpTranslator(ast.NodeVisitor):
         self.add_line("using System.IO;")
         self.add_line()
         
-        self.add_line("namespace PythonTranslated")
-        self.add_line("{")
-        self.indent_level += 1
-        
-        # Check if we need a main class for standalone functions
-        has_functions = any(isinstance(child, ast.FunctionDef) for child in node.body)
-        has_classes = any(isinstance(child, ast.ClassDef) for child in node.body)
-        
-        if has_functions and not has_classes:
-            self.add_line("public class Program")
-            self.add_line("{")
-            self.indent_level += 1
-        
-        for child in node.body:
-            self.visit(child)
-        
-        if has_functions and not has_classes:
-            self.indent_level -= 1
-            self.add_line("}")
-        
-        self.indent_level -= 1
-        self.add_line("}")
+        with self._block("namespace PythonTranslated"):
+            # Check if we need a main class for standalone functions
+            has_functions = has_classes = False
+            for child in node.body:
+                child_type = type(child)
+                if child_type is _FunctionDef:
+                    has_functions = True
+                elif child_type is _ClassDef:
+                    has_classes = True
+                else:
+                    continue
+                if has_functions and has_classes:
+                    break
+            
+            if has_functions and not has_classes:
+                with self._block("public class Program"):
+                    self._emit_block(node.body)
+            else:
+                self._emit_block(node.body)
 
     def visit_ClassDef(self, node):
         """Handle class definitions."""
@@ -162,19 +329,18 @@ class PythonToCSharpTranslator(ast.NodeVisitor):
             base_names = [self.visit_expr(base) for base in node.bases]
             bases = f" : {', '.join(base_names)}"
         
-        self.add_line(f"public class {node.name}{bases}")
-        self.add_line("{")
-        self.indent_level += 1
-        self.in_class = True
-        self.current_class = node.name
-        
-        for child in node.body:
-            self.visit(child)
-        
-        self.in_class = False
-        self.current_class = None
-        self.indent_level -= 1
-        self.add_line("}")
+        with self._block(f"public class {node.name}{bases}"):
+            self.in_class = True
+            self.current_class = node.name
+            
+            # __slots__ only shapes Python's instance layout; C# has no equivalent
+            yield [stmt for stmt in node.body
+                   if not (type(stmt) is ast.Assign and len(stmt.targets) == 1
+                           and type(stmt.targets[0]) is _Name
+                           and stmt.targets[0].id == "__slots__")]
+            
+            self.in_class = False
+            self.current_class = None
 
     def visit_FunctionDef(self, node):
         """Handle function definitions."""
@@ -183,7 +349,7 @@ class PythonToCSharpTranslator(ast.NodeVisitor):
         # Handle constructor
         if self.in_class and node.name == "__init__":
             params = self.get_parameters(node.args)
-            self.add_line(f"public {self.current_class}({params})")
+            header = f"public {self.current_class}({params})"
         else:
             # Determine access modifier
             access = "public" if self.in_class else "public static"
@@ -194,16 +360,10 @@ class PythonToCSharpTranslator(ast.NodeVisitor):
                 return_type = self.get_type_annotation(node.returns)
             
             params = self.get_parameters(node.args)
-            self.add_line(f"{access} {return_type} {node.name}({params})")
+            header = f"{access} {return_type} {node.name}({params})"
         
-        self.add_line("{")
-        self.indent_level += 1
-        
-        for child in node.body:
-            self.visit(child)
-        
-        self.indent_level -= 1
-        self.add_line("}")
+        with self._block(header):
+            yield node.body
 
     def get_parameters(self, args):
         """Extract function parameters."""
@@ -217,9 +377,9 @@ class PythonToCSharpTranslator(ast.NodeVisitor):
 
     def get_type_annotation(self, annotation):
         """Convert Python type annotation to C# type."""
-        if isinstance(annotation, ast.Name):
-            return self.type_mapping.get(annotation.id, annotation.id)
-        elif isinstance(annotation, ast.Constant):
+        if type(annotation) is _Name:
+            return _TYPE_MAPPING.get(annotation.id, annotation.id)
+        elif type(annotation) is _Constant:
             return str(annotation.value)
         return "object"
 
@@ -237,15 +397,15 @@ class PythonToCSharpTranslator(ast.NodeVisitor):
             target = node.targets[0]
             value = self.visit_expr(node.value)
             
-            if isinstance(target, ast.Name):
+            if type(target) is _Name:
                 # Simple variable assignment
                 var_type = self.infer_type(node.value)
                 self.add_line(f"{var_type} {target.id} = {value};")
-            elif isinstance(target, ast.Attribute):
+            elif type(target) is _Attribute:
                 # Attribute assignment
                 obj = self.visit_expr(target.value)
                 self.add_line(f"{obj}.{target.attr} = {value};")
-            elif isinstance(target, ast.Subscript):
+            elif type(target) is _Subscript:
                 # Subscript assignment
                 obj = self.visit_expr(target.value)
                 index = self.visit_expr(target.slice)
@@ -253,7 +413,7 @@ class PythonToCSharpTranslator(ast.NodeVisitor):
 
     def visit_AnnAssign(self, node):
         """Handle annotated assignments (type hints)."""
-        if node.target and isinstance(node.target, ast.Name):
+        if node.target and type(node.target) is _Name:
             var_type = self.get_type_annotation(node.annotation)
             var_name = node.target.id
             
@@ -262,96 +422,82 @@ class PythonToCSharpTranslator(ast.NodeVisitor):
                 self.add_line(f"{var_type} {var_name} = {value};")
             else:
                 self.add_line(f"{var_type} {var_name};")
+        elif node.value:
+            # Annotated attribute/subscript (self.x: T = v): the annotation
+            # can't declare a member here, so keep just the assignment
+            target = self.visit_expr(node.target)
+            value = self.visit_expr(node.value)
+            self.add_line(f"{target} = {value};")
 
     def visit_AugAssign(self, node):
         """Handle augmented assignments (+=, -=, etc.)."""
         target = self.visit_expr(node.target)
         value = self.visit_expr(node.value)
-        op = self.get_operator(node.op)
-        self.add_line(f"{target} {op}= {value};")
+        op = _BIN_OPS.get(type(node.op), '?')
+        self.buf.write(f"{self._indent_str}{target} {op}= {value};\n")
 
     def visit_If(self, node):
-        """Handle if statements."""
-        condition = self.visit_expr(node.test)
-        self.add_line(f"if ({condition})")
-        self.add_line("{")
-        self.indent_level += 1
-        
-        for child in node.body:
-            self.visit(child)
-        
-        self.indent_level -= 1
-        self.add_line("}")
-        
-        # Handle elif/else
-        if node.orelse:
-            if len(node.orelse) == 1 and isinstance(node.orelse[0], ast.If):
-                # elif case
-                self.add_line("else")
-                self.visit(node.orelse[0])
-            else:
+        """Handle if statements, walking elif chains iteratively."""
+        keyword = "if"
+        while True:
+            condition = self.visit_expr(node.test)
+            with self._block(f"{keyword} ({condition})"):
+                yield node.body
+            
+            orelse = node.orelse
+            if len(orelse) == 1 and type(orelse[0]) is _If:
+                # elif case: continue the chain as "else if"
+                node = orelse[0]
+                keyword = "else if"
+                continue
+            
+            if orelse:
                 # else case
-                self.add_line("else")
-                self.add_line("{")
-                self.indent_level += 1
-                
-                for child in node.orelse:
-                    self.visit(child)
-                
-                self.indent_level -= 1
-                self.add_line("}")
+                with self._block("else"):
+                    yield orelse
+            break
 
     def visit_While(self, node):
         """Handle while loops."""
         condition = self.visit_expr(node.test)
-        self.add_line(f"while ({condition})")
-        self.add_line("{")
-        self.indent_level += 1
-        
-        for child in node.body:
-            self.visit(child)
-        
-        self.indent_level -= 1
-        self.add_line("}")
+        with self._block(f"while ({condition})"):
+            yield node.body
 
     def visit_For(self, node):
         """Handle for loops."""
-        if isinstance(node.iter, ast.Call) and isinstance(node.iter.func, ast.Name):
-            if node.iter.func.id == "range":
-                # Handle range() loops
-                args = node.iter.args
-                target_name = node.target.id if isinstance(node.target, ast.Name) else "i"
-                
-                if len(args) == 1:
-                    # range(n)
-                    end = self.visit_expr(args[0])
-                    self.add_line(f"for (int {target_name} = 0; {target_name} < {end}; {target_name}++)")
-                elif len(args) == 2:
-                    # range(start, end)
-                    start = self.visit_expr(args[0])
-                    end = self.visit_expr(args[1])
-                    self.add_line(f"for (int {target_name} = {start}; {target_name} < {end}; {target_name}++)")
-                elif len(args) == 3:
-                    # range(start, end, step)
-                    start = self.visit_expr(args[0])
-                    end = self.visit_expr(args[1])
-                    step = self.visit_expr(args[2])
-                    self.add_line(f"for (int {target_name} = {start}; {target_name} < {end}; {target_name} += {step})")
+        header = None
+        it = node.iter
+        target = node.target
+        if type(it) is _Call and type(it.func) is _Name and it.func.id == "range":
+            # Handle range() loops
+            args = it.args
+            target_name = target.id if type(target) is _Name else "i"
+            n = len(args)
+            
+            if n == 1:
+                # range(n)
+                end = self.visit_expr(args[0])
+                header = f"for (int {target_name} = 0; {target_name} < {end}; {target_name}++)"
+            elif n == 2:
+                # range(start, end)
+                start = self.visit_expr(args[0])
+                end = self.visit_expr(args[1])
+                header = f"for (int {target_name} = {start}; {target_name} < {end}; {target_name}++)"
+            elif n == 3:
+                # range(start, end, step)
+                start = self.visit_expr(args[0])
+                end = self.visit_expr(args[1])
+                step = self.visit_expr(args[2])
+                header = f"for (int {target_name} = {start}; {target_name} < {end}; {target_name} += {step})"
         else:
             # Handle foreach loops
-            iterable = self.visit_expr(node.iter)
+            iterable = self.visit_expr(it)
             var_type = "var"  # Use var for type inference
-            target_name = node.target.id if isinstance(node.target, ast.Name) else "item"
-            self.add_line(f"foreach ({var_type} {target_name} in {iterable})")
+            target_name = target.id if type(target) is _Name else "item"
+            header = f"foreach ({var_type} {target_name} in {iterable})"
         
-        self.add_line("{")
-        self.indent_level += 1
-        
-        for child in node.body:
-            self.visit(child)
-        
-        self.indent_level -= 1
-        self.add_line("}")
+        with self._block(header):
+            yield node.body
 
     def visit_Break(self, node):
         """Handle break statements."""
@@ -363,53 +509,33 @@ class PythonToCSharpTranslator(ast.NodeVisitor):
 
     def visit_Try(self, node):
         """Handle try-except blocks."""
-        self.add_line("try")
-        self.add_line("{")
-        self.indent_level += 1
-        
-        for child in node.body:
-            self.visit(child)
-        
-        self.indent_level -= 1
-        self.add_line("}")
+        with self._block("try"):
+            yield node.body
         
         # Handle except clauses
         for handler in node.handlers:
-            self.visit_ExceptHandler(handler)
+            yield from self.visit_ExceptHandler(handler)
         
         # Handle finally
         if node.finalbody:
-            self.add_line("finally")
-            self.add_line("{")
-            self.indent_level += 1
-            
-            for child in node.finalbody:
-                self.visit(child)
-            
-            self.indent_level -= 1
-            self.add_line("}")
+            with self._block("finally"):
+                yield node.finalbody
 
     def visit_ExceptHandler(self, node):
         """Handle except clauses."""
         if node.type:
             exception_type = self.visit_expr(node.type)
-            exception_type = self.exception_mapping.get(exception_type, exception_type)
+            exception_type = _EXCEPTION_MAPPING.get(exception_type, exception_type)
             
             if node.name:
-                self.add_line(f"catch ({exception_type} {node.name})")
+                header = f"catch ({exception_type} {node.name})"
             else:
-                self.add_line(f"catch ({exception_type})")
+                header = f"catch ({exception_type})"
         else:
-            self.add_line("catch (Exception)")
+            header = "catch (Exception)"
         
-        self.add_line("{")
-        self.indent_level += 1
-        
-        for child in node.body:
-            self.visit(child)
-        
-        self.indent_level -= 1
-        self.add_line("}")
+        with self._block(header):
+            yield node.body
 
     def visit_Raise(self, node):
         """Handle raise statements."""
@@ -448,18 +574,16 @@ class PythonToCSharpTranslator(ast.NodeVisitor):
         # becomes: iter.Where(condition).Select(target => expr)
         
         iter_expr = self.visit_expr(node.generators[0].iter)
-        target = node.generators[0].target.id if isinstance(node.generators[0].target, ast.Name) else "x"
+        target = node.generators[0].target.id if type(node.generators[0].target) is _Name else "x"
         element_expr = self.visit_expr(node.elt)
         
-        result = f"{iter_expr}.Select({target} => {element_expr})"
+        # Handle conditions: every if clause goes into a single Where()
+        conditions = [self.visit_expr(if_clause)
+                      for generator in node.generators
+                      for if_clause in generator.ifs]
+        where = f".Where({target} => {' && '.join(conditions)})" if conditions else ""
         
-        # Handle conditions
-        for generator in node.generators:
-            for if_clause in generator.ifs:
-                condition = self.visit_expr(if_clause)
-                result = f"{iter_expr}.Where({target} => {condition}).Select({target} => {element_expr})"
-        
-        return result + ".ToList()"
+        return f"{iter_expr}{where}.Select({target} => {element_expr}).ToList()"
 
     def visit_DictComp(self, node):
         """Handle dictionary comprehensions."""
@@ -467,7 +591,7 @@ class PythonToCSharpTranslator(ast.NodeVisitor):
         # becomes: iter.ToDictionary(target => key, target => value)
         
         iter_expr = self.visit_expr(node.generators[0].iter)
-        target = node.generators[0].target.id if isinstance(node.generators[0].target, ast.Name) else "x"
+        target = node.generators[0].target.id if type(node.generators[0].target) is _Name else "x"
         key_expr = self.visit_expr(node.key)
         value_expr = self.visit_expr(node.value)
         
@@ -479,7 +603,7 @@ class PythonToCSharpTranslator(ast.NodeVisitor):
         # becomes: new HashSet<T>(iter.Select(target => expr))
         
         iter_expr = self.visit_expr(node.generators[0].iter)
-        target = node.generators[0].target.id if isinstance(node.generators[0].target, ast.Name) else "x"
+        target = node.generators[0].target.id if type(node.generators[0].target) is _Name else "x"
         element_expr = self.visit_expr(node.elt)
         
         return f"new HashSet<object>({iter_expr}.Select({target} => {element_expr}))"
@@ -487,66 +611,64 @@ class PythonToCSharpTranslator(ast.NodeVisitor):
     def visit_UnaryOp(self, node):
         """Handle unary operations."""
         operand = self.visit_expr(node.operand)
-        op = self.get_unary_operator(node.op)
+        op = _UNARY_OPS.get(type(node.op), '?')
         return f"{op}{operand}"
 
     def visit_Tuple(self, node):
         """Handle tuple creation and unpacking."""
         if len(node.elts) <= 8:  # C# Tuple limit
-            elements = [self.visit_expr(elt) for elt in node.elts]
-            return f"({', '.join(elements)})"
+            return f"({self._join_args(node.elts)})"
         else:
             # Use array for large tuples
-            elements = [self.visit_expr(elt) for elt in node.elts]
-            return f"new object[] {{{', '.join(elements)}}}"
+            return f"new object[] {{{self._join_args(node.elts)}}}"
+
+    def _join_args(self, nodes):
+        """Translate a sequence of expressions into a comma-separated list."""
+        return ", ".join(map(self.visit_expr, nodes))
 
     def visit_expr(self, node):
         """Visit an expression node and return the C# equivalent."""
-        if isinstance(node, ast.Constant):
-            return self.visit_Constant(node)
-        elif isinstance(node, ast.Name):
-            return self.visit_Name(node)
-        elif isinstance(node, ast.BinOp):
-            return self.visit_BinOp(node)
-        elif isinstance(node, ast.UnaryOp):
-            return self.visit_UnaryOp(node)
-        elif isinstance(node, ast.Compare):
-            return self.visit_Compare(node)
-        elif isinstance(node, ast.Call):
-            return self.visit_Call(node)
-        elif isinstance(node, ast.Attribute):
-            return self.visit_Attribute(node)
-        elif isinstance(node, ast.Subscript):
-            return self.visit_Subscript(node)
-        elif isinstance(node, ast.List):
-            return self.visit_List(node)
-        elif isinstance(node, ast.Dict):
-            return self.visit_Dict(node)
-        elif isinstance(node, ast.Set):
-            return self.visit_Set(node)
-        elif isinstance(node, ast.Tuple):
-            return self.visit_Tuple(node)
-        elif isinstance(node, ast.ListComp):
-            return self.visit_ListComp(node)
-        elif isinstance(node, ast.DictComp):
-            return self.visit_DictComp(node)
-        elif isinstance(node, ast.SetComp):
-            return self.visit_SetComp(node)
-        elif isinstance(node, ast.BoolOp):
-            return self.visit_BoolOp(node)
-        elif isinstance(node, ast.JoinedStr):
-            return self.visit_JoinedStr(node)
-        elif isinstance(node, ast.FormattedValue):
-            return self.visit_FormattedValue(node)
-        else:
-            return f"/* Unsupported expression: {type(node).__name__} */"
+        node_type = type(node)
+        # Fast path for the two most common leaves; mirrors visit_Name/visit_Constant
+        if node_type is _Name:
+            name = node.id
+            return _TYPE_MAPPING.get(name, name)
+        if node_type is _Constant:
+            value = node.value
+            if type(value) is str:
+                literal = self._string_literals.get(value)
+                if literal is None:
+                    literal = self._string_literals[value] = f'"{value}"'
+                return literal
+            if value is True:
+                return "true"
+            if value is False:
+                return "false"
+            if value is None:
+                return "null"
+            return str(value)
+        
+        handler = self._EXPR_DISPATCH.get(node_type)
+        if handler is not None:
+            return handler(self, node)
+        return f"/* Unsupported expression: {node_type.__name__} */"
+
+    def _dispatch_expr(self, node):
+        """visit_expr without the Name/Constant fast path, for subclasses overriding those."""
+        handler = self._EXPR_DISPATCH.get(type(node))
+        if handler is not None:
+            return handler(self, node)
+        return f"/* Unsupported expression: {type(node).__name__} */"
 
     def visit_Constant(self, node):
         """Handle constant values."""
         value = node.value
         if isinstance(value, str):
             # Escape quotes and return as string literal
-            return f'"{value}"'
+            literal = self._string_literals.get(value)
+            if literal is None:
+                literal = self._string_literals[value] = f'"{value}"'
+            return literal
         elif isinstance(value, bool):
             return "true" if value else "false"  
         elif value is None:
@@ -556,13 +678,13 @@ class PythonToCSharpTranslator(ast.NodeVisitor):
 
     def visit_Name(self, node):
         """Handle name references."""
-        return self.type_mapping.get(node.id, node.id)
+        return _TYPE_MAPPING.get(node.id, node.id)
 
     def visit_BinOp(self, node):
         """Handle binary operations."""
         left = self.visit_expr(node.left)
         right = self.visit_expr(node.right)
-        op = self.get_operator(node.op)
+        op = _BIN_OPS.get(type(node.op), '?')
         return f"({left} {op} {right})"
 
     def visit_Compare(self, node):
@@ -570,31 +692,28 @@ class PythonToCSharpTranslator(ast.NodeVisitor):
         left = self.visit_expr(node.left)
         comparisons = []
         
-        for i, (op, comparator) in enumerate(zip(node.ops, node.comparators)):
+        # a < b < c becomes (a < b && b < c); each right operand is the next left
+        for op, comparator in zip(node.ops, node.comparators):
             right = self.visit_expr(comparator)
-            op_str = self.get_comparison_operator(op)
-            
-            if i == 0:
-                comparisons.append(f"{left} {op_str} {right}")
-            else:
-                comparisons.append(f"{op_str} {right}")
+            comparisons.append(f"{left} {_COMPARE_OPS.get(type(op), '?')} {right}")
+            left = right
         
         return f"({' && '.join(comparisons)})"
 
     def visit_BoolOp(self, node):
         """Handle boolean operations."""
-        op = "&&" if isinstance(node.op, ast.And) else "||"
+        op = "&&" if type(node.op) is _And else "||"
         values = [self.visit_expr(value) for value in node.values]
         return f"({f' {op} '.join(values)})"
 
     def visit_Call(self, node):
         """Handle function calls."""
-        if isinstance(node.func, ast.Name):
+        if type(node.func) is _Name:
             func_name = node.func.id
             
             # Handle built-in functions
-            if func_name in self.function_mapping:
-                cs_func = self.function_mapping[func_name]
+            if func_name in _FUNCTION_MAPPING:
+                cs_func = _FUNCTION_MAPPING[func_name]
                 args = [self.visit_expr(arg) for arg in node.args]
                 
                 # Special cases for different function types
@@ -616,26 +735,23 @@ class PythonToCSharpTranslator(ast.NodeVisitor):
                     return f"{cs_func}({', '.join(args)})"
             else:
                 # Regular function call
-                args = [self.visit_expr(arg) for arg in node.args]
-                return f"{func_name}({', '.join(args)})"
+                return f"{func_name}({self._join_args(node.args)})"
         
-        elif isinstance(node.func, ast.Attribute):
+        elif type(node.func) is _Attribute:
             # Method call
             obj = self.visit_expr(node.func.value)
             method = node.func.attr
-            args = [self.visit_expr(arg) for arg in node.args]
             
             # Map Python methods to C# methods
-            if method in self.method_mapping:
-                method = self.method_mapping[method]
+            if method in _METHOD_MAPPING:
+                method = _METHOD_MAPPING[method]
             
-            return f"{obj}.{method}({', '.join(args)})"
+            return f"{obj}.{method}({self._join_args(node.args)})"
         
         else:
             # Complex function call
             func = self.visit_expr(node.func)
-            args = [self.visit_expr(arg) for arg in node.args]
-            return f"{func}({', '.join(args)})"
+            return f"{func}({self._join_args(node.args)})"
 
     def visit_Attribute(self, node):
         """Handle attribute access."""
@@ -646,7 +762,7 @@ class PythonToCSharpTranslator(ast.NodeVisitor):
         """Handle subscript operations."""
         obj = self.visit_expr(node.value)
         
-        if isinstance(node.slice, ast.Slice):
+        if type(node.slice) is _Slice:
             # Handle slicing
             start = self.visit_expr(node.slice.lower) if node.slice.lower else "0"
             stop = self.visit_expr(node.slice.upper) if node.slice.upper else f"{obj}.Count"
@@ -660,8 +776,7 @@ class PythonToCSharpTranslator(ast.NodeVisitor):
 
     def visit_List(self, node):
         """Handle list literals."""
-        elements = [self.visit_expr(elt) for elt in node.elts]
-        return f"new List<object> {{{', '.join(elements)}}}"
+        return f"new List<object> {{{self._join_args(node.elts)}}}"
 
     def visit_Dict(self, node):
         """Handle dictionary literals."""
@@ -675,17 +790,16 @@ class PythonToCSharpTranslator(ast.NodeVisitor):
 
     def visit_Set(self, node):
         """Handle set literals."""
-        elements = [self.visit_expr(elt) for elt in node.elts]
-        return f"new HashSet<object> {{{', '.join(elements)}}}"
+        return f"new HashSet<object> {{{self._join_args(node.elts)}}}"
 
     def visit_JoinedStr(self, node):
         """Handle f-string literals."""
         # Convert f"Hello {name}" to $"Hello {name}"
         parts = []
         for value in node.values:
-            if isinstance(value, ast.Constant):
+            if type(value) is _Constant:
                 parts.append(value.value)
-            elif isinstance(value, ast.FormattedValue):
+            elif type(value) is _FormattedValue:
                 expr = self.visit_expr(value.value)
                 parts.append(f"{{{expr}}}")
         
@@ -696,53 +810,9 @@ class PythonToCSharpTranslator(ast.NodeVisitor):
         expr = self.visit_expr(node.value)
         return f"{{{expr}}}"
 
-    def get_operator(self, op):
-        """Convert Python operators to C# operators."""
-        operators = {
-            ast.Add: '+',
-            ast.Sub: '-',
-            ast.Mult: '*',
-            ast.Div: '/',
-            ast.FloorDiv: '/',  # Integer division in C#
-            ast.Mod: '%',
-            ast.Pow: 'Math.Pow',  # Special case
-            ast.LShift: '<<',
-            ast.RShift: '>>',
-            ast.BitOr: '|',
-            ast.BitXor: '^',
-            ast.BitAnd: '&',
-        }
-        return operators.get(type(op), '?')
-
-    def get_unary_operator(self, op):
-        """Convert Python unary operators to C# operators."""
-        operators = {
-            ast.UAdd: '+',
-            ast.USub: '-',
-            ast.Not: '!',
-            ast.Invert: '~',
-        }
-        return operators.get(type(op), '?')
-
-    def get_comparison_operator(self, op):
-        """Convert Python comparison operators to C# operators."""
-        operators = {
-            ast.Eq: '==',
-            ast.NotEq: '!=',
-            ast.Lt: '<',
-            ast.LtE: '<=',
-            ast.Gt: '>',
-            ast.GtE: '>=',
-            ast.Is: '==',  # Reference equality
-            ast.IsNot: '!=',
-            ast.In: '.Contains',  # Special case
-            ast.NotIn: '!.Contains',  # Special case
-        }
-        return operators.get(type(op), '?')
-
     def infer_type(self, node):
         """Infer C# type from Python expression."""
-        if isinstance(node, ast.Constant):
+        if type(node) is _Constant:
             value = node.value
             if isinstance(value, int):
                 return "int"
@@ -754,42 +824,159 @@ class PythonToCSharpTranslator(ast.NodeVisitor):
                 return "bool"
             elif value is None:
                 return "object"
-        elif isinstance(node, ast.List):
+        elif type(node) is _List:
             return "List<object>"
-        elif isinstance(node, ast.Dict):
+        elif type(node) is _Dict:
             return "Dictionary<object, object>"
-        elif isinstance(node, ast.Set):
+        elif type(node) is _Set:
             return "HashSet<object>"
-        elif isinstance(node, ast.Call):
-            if isinstance(node.func, ast.Name):
+        elif type(node) is _Call:
+            if type(node.func) is _Name:
                 if node.func.id in ["int", "float", "str", "bool"]:
-                    return self.type_mapping[node.func.id]
+                    return _TYPE_MAPPING[node.func.id]
         
         return "var"  # Use var for type inference
 
+    # Expression node type -> handler, looked up by exact type in visit_expr
+    _EXPR_DISPATCH = {
+        ast.Constant: visit_Constant,
+        ast.Name: visit_Name,
+        ast.BinOp: visit_BinOp,
+        ast.UnaryOp: visit_UnaryOp,
+        ast.Compare: visit_Compare,
+        ast.Call: visit_Call,
+        ast.Attribute: visit_Attribute,
+        ast.Subscript: visit_Subscript,
+        ast.List: visit_List,
+        ast.Dict: visit_Dict,
+        ast.Set: visit_Set,
+        ast.Tuple: visit_Tuple,
+        ast.ListComp: visit_ListComp,
+        ast.DictComp: visit_DictComp,
+        ast.SetComp: visit_SetComp,
+        ast.BoolOp: visit_BoolOp,
+        ast.JoinedStr: visit_JoinedStr,
+        ast.FormattedValue: visit_FormattedValue,
+    }
+
+
+class _ConstantFolder(ast.NodeTransformer):
+    """Fold arithmetic on literal operands into a single Constant.
+
+    Runs before translation so `60 * 60 * 24` becomes `86400` instead of a
+    nested C# expression. Only int/float arithmetic, unary +/- and string
+    concatenation are folded; anything that raises or would produce a huge
+    value is left as written.
+    """
+
+    # Folded ints are declared as C# int by infer_type, so they must fit int32
+    _INT_MIN = -2 ** 31
+    _INT_MAX = 2 ** 31 - 1
+    _MAX_INT_BITS = 31
+    _MAX_STR_LEN = 4096
+
+    _FOLDABLE = {
+        ast.Add: lambda a, b: a + b,
+        ast.Sub: lambda a, b: a - b,
+        ast.Mult: lambda a, b: a * b,
+        ast.Div: lambda a, b: a / b,
+        ast.FloorDiv: lambda a, b: a // b,
+        ast.Mod: lambda a, b: a % b,
+        ast.Pow: lambda a, b: a ** b,
+        ast.LShift: lambda a, b: a << b,
+        ast.RShift: lambda a, b: a >> b,
+        ast.BitOr: lambda a, b: a | b,
+        ast.BitXor: lambda a, b: a ^ b,
+        ast.BitAnd: lambda a, b: a & b,
+    }
+
+    def visit_UnaryOp(self, node):
+        self.generic_visit(node)
+        operand = node.operand
+        if (type(node.op) in (ast.USub, ast.UAdd) and type(operand) is _Constant
+                and type(operand.value) in (int, float)):
+            value = -operand.value if type(node.op) is ast.USub else operand.value
+            if type(value) is int and not self._INT_MIN <= value <= self._INT_MAX:
+                return node
+            return ast.copy_location(ast.Constant(value), node)
+        return node
+
+    def visit_BinOp(self, node):
+        self.generic_visit(node)
+        left, right = node.left, node.right
+        if type(left) is not _Constant or type(right) is not _Constant:
+            return node
+        a, b = left.value, right.value
+        op_type = type(node.op)
+        
+        if type(a) is str and type(b) is str:
+            if op_type is not ast.Add or len(a) + len(b) > self._MAX_STR_LEN:
+                return node
+        elif type(a) in (int, float) and type(b) in (int, float):
+            # Refuse shifts and powers whose result is known to be too wide
+            # before computing it, so huge values are never built
+            if op_type is ast.Pow and type(a) is int and type(b) is int and b > 0:
+                if (a.bit_length() - 1) * b > self._MAX_INT_BITS:
+                    return node
+            elif op_type is ast.LShift and type(a) is int and type(b) is int:
+                if a.bit_length() + b > self._MAX_INT_BITS:
+                    return node
+        else:
+            return node
+        
+        fold = self._FOLDABLE.get(op_type)
+        if fold is None:
+            return node
+        try:
+            value = fold(a, b)
+        except (ArithmeticError, ValueError):
+            return node
+        
+        if type(value) not in (int, float, str):
+            return node  # e.g. (-8) ** 0.5 is complex
+        if type(value) is float and value - value != 0:
+            return node  # inf/nan have no C# literal form
+        if type(value) is int and not self._INT_MIN <= value <= self._INT_MAX:
+            return node
+        return ast.copy_location(ast.Constant(value), node)
+
 
 def translate_file(input_file, output_file=None):
-    """Translate a Python file to C#."""
+    """Translate a Python file to C#.
+
+    With `output_file` the C# code is written to that file as it is generated
+    and the output path is returned; otherwise the code is printed and returned.
+    """
     try:
-        with open(input_file, 'r', encoding='utf-8') as f:
+        with open(input_file, 'rb') as f:
             python_code = f.read()
         
-        # Parse Python code into AST
-        tree = ast.parse(python_code)
+        # Parse Python code into AST; the parser decodes the bytes itself,
+        # honouring BOMs and PEP 263 coding declarations
+        tree = ast.parse(python_code, filename=input_file)
+        
+        # Fold literal arithmetic so it is emitted as a single value
+        tree = _ConstantFolder().visit(tree)
+        
+        if output_file:
+            # Stream the translation straight into the output file
+            with open(output_file, 'w', encoding='utf-8') as f:
+                try:
+                    PythonToCSharpTranslator(f).visit(tree)
+                except BaseException:
+                    f.close()
+                    os.remove(output_file)  # Don't leave a half-written file behind
+                    raise
+            print(f"✅ Translation complete: {input_file} -> {output_file}")
+            return output_file
         
         # Translate to C#
         translator = PythonToCSharpTranslator()
         translator.visit(tree)
         
         # Generate output
-        csharp_code = '\n'.join(translator.output)
-        
-        if output_file:
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(csharp_code)
-            print(f"✅ Translation complete: {input_file} -> {output_file}")
-        else:
-            print(csharp_code)
+        csharp_code = translator.buf.getvalue()
+        print(csharp_code)
         
         return csharp_code
         
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Optional compiled build of the Python to C# translator.
+
+The translator runs unchanged as a plain script. Compiling the module with
+Cython removes interpreter dispatch overhead from the AST walk:
+
+    pip install cython
+    python setup.py build_ext --inplace
+
+Afterwards `import py_to_cs_agent` loads the compiled extension, while
+`python py_to_cs_agent.py` keeps running the source file. Without Cython
+installed this script only installs the pure-Python module.
+
+The sample test_input.py can additionally be compiled with mypyc, which
+uses its existing type annotations (mypyc ships with mypy):
+
+    BUILD_MYPYC=1 python setup.py build_ext --inplace
+"""
+
+import os
+
+from setuptools import Extension, setup
+
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    ext_modules = []
+else:
+    ext_modules = cythonize(
+        [
+            Extension("py_to_cs_agent", ["py_to_cs_agent.py"], extra_compile_args=["-O3"]),
+            # Compiled cdef-class version of the sample Calculator in test_input.py
+            Extension("calculator", ["calculator.pyx"], extra_compile_args=["-O3"]),
+        ],
+        compiler_directives={"language_level": 3},
+    )
+
+if os.environ.get("BUILD_MYPYC"):
+    from mypyc.build import mypycify
+
+    ext_modules += mypycify(["test_input.py"])
+
+setup(
+    name="python-to-csharp-translator",
+    version="1.0.0",
+    description="Automatic Python to C# code translator using AST parsing",
+    py_modules=["py_to_cs_agent"],
+    ext_modules=ext_modules,
+    python_requires=">=3.7",
+)
@@ -3,26 +3,57 @@
 Test Python file for translation to C#
 """
 
+from collections import deque
+from typing import NamedTuple, Optional, Sequence
+
+# Array helpers; they only import NumPy/Numba once an array arrives
+from calculator_kernels import array_stats, process_array
+
+
+# Sample inputs for main(); tuples are compiled as constants, not rebuilt per call
+_NUMBERS = (1, -2, 3, -4, 5)
+_STATS_INPUT = (1, 2, 3, 4, 5)
+
+
+class Stats(NamedTuple):
+    sum: int
+    max: int
+    count: int  # type: ignore[assignment]  # shadows tuple.count
+
+
 class Calculator:
-    def __init__(self, name: str):
+    __slots__ = ('name', 'history')
+    
+    def __init__(self, name: str, history_size: Optional[int] = None):
         self.name = name
-        self.history = []
+        # With history_size set, only the most recent operations are kept
+        self.history: deque = deque(maxlen=history_size)
     
     def add(self, a: int, b: int) -> int:
         result = a + b
-        self.history.append(f"Added {a} + {b} = {result}")
+        # Store the operands; the message is only built when history is read
+        self.history.append((a, b, result))
         return result
     
-    def process_numbers(self, numbers: list) -> list:
+    def format_history(self) -> list:
+        return [f"Added {a} + {b} = {result}" for a, b, result in self.history]
+    
+    def process_numbers(self, numbers: Sequence[int]) -> Sequence[int]:
+        # NumPy arrays stay arrays (see calculator_kernels.py); converting a
+        # list to an array and back costs more than the comprehension itself
+        result = process_array(numbers)
+        if result is not None:
+            return result
         # List comprehension example
         return [x * 2 for x in numbers if x > 0]
     
-    def get_stats(self, data: list) -> dict:
-        return {
-            'sum': sum(data),
-            'max': max(data),
-            'count': len(data)
-        }
+    def get_stats(self, data: Sequence[int]) -> Stats:
+        # Arrays are reduced in compiled code; lists keep the builtins, which
+        # already loop in C and avoid the conversion to an array
+        stats = array_stats(data)
+        if stats is not None:
+            return Stats._make(stats)
+        return Stats(sum(data), max(data), len(data))
 
 def main():
     calc = Calculator("MyCalc")
@@ -32,19 +63,20 @@ def main():
     print(f"Result: {result}")
     
     # List processing
-    numbers = [1, -2, 3, -4, 5]
-    processed = calc.process_numbers(numbers)
+    processed = calc.process_numbers(_NUMBERS)
     print(f"Processed: {processed}")
     
     # Statistics
-    stats = calc.get_stats([1, 2, 3, 4, 5])
+    stats = calc.get_stats(_STATS_INPUT)
     print(f"Stats: {stats}")
     
-    # Exception handling
-    try:
-        result = 10 / 0
-    except ZeroDivisionError as e:
-        print(f"Error: {e}")
+    # Exception handling demo; the divisor is a literal zero, so it is only
+    # run in debug mode and `python -O` compiles the block away entirely
+    if __debug__:
+        try:
+            result = 10 / 0
+        except ZeroDivisionError as e:
+            print(f"Error: {e}")
     
     # Loops
     for i in range(3):